@@ -1,38 +1,108 @@
 import aiohttp
 import asyncio
 import argparse
-from datetime import datetime
-from typing import List
+import time
+from typing import Any, Callable, Coroutine, Dict, List
 
 from utils.binance_api_utils import BinanceAPI
 from utils import date_utils, print_utils
 
 
 
+TOP_PAIRS_REFRESH_INTERVAL = 25  # Seconds between two refreshes of the top pairs lists
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Creates an HTTP session meant to be kept for the lifetime of the process.
+
+    Returns:
+        aiohttp.ClientSession: The session, reusing DNS lookups and keep-alive connections across requests.
+    """
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=30, ttl_dns_cache=300, keepalive_timeout=75)
+    # Large payloads such as the 24h ticker and the exchange info shrink several times when compressed
+    return aiohttp.ClientSession(connector=connector,
+                                 timeout=aiohttp.ClientTimeout(total=5),
+                                 headers={"Accept-Encoding": "gzip, deflate"})
+
+
+async def fetch_top_pairs(binance_api: BinanceAPI) -> Dict[str, List[str]]:
+    """
+    Retrieves the top shorted, longed, gaining and losing pairs.
+
+    Args:
+        binance_api (BinanceAPI): The API wrapper used for making the requests.
+
+    Returns:
+        Dict[str, List[str]]: A dictionary mapping the names of the top pairs lists to the trading pair symbols.
+    """
+    top_shorted_pairs, top_longed_pairs = await binance_api.fetch_top_funded_pairs(top_n=5)
+    top_gainers, top_losers = await binance_api.get_top_gainers_and_losers(top_n=5)
+    return {"top_shorted_pairs": top_shorted_pairs,
+            "top_longed_pairs": top_longed_pairs,
+            "top_gainers": top_gainers,
+            "top_losers": top_losers}
+
+
+async def refresh_top_pairs(binance_api: BinanceAPI, top_pairs: Dict[str, List[str]], refresh_evt: asyncio.Event) -> None:
+    """
+    Periodically refreshes `top_pairs` in place and requests a redraw.
+    The previous lists are kept when a refresh fails, and the refresh is retried at the next interval.
+
+    Args:
+        binance_api (BinanceAPI): The API wrapper used for making the requests.
+        top_pairs (Dict[str, List[str]]): The top pairs lists, as returned by `fetch_top_pairs`.
+        refresh_evt (asyncio.Event): The event set to request a redraw.
+    """
+    while True:
+        await asyncio.sleep(TOP_PAIRS_REFRESH_INTERVAL)
+        try:
+            top_pairs.update(await fetch_top_pairs(binance_api))
+        except Exception:
+            # Any failure, not only network ones, must not end the task and freeze the lists
+            continue
+        refresh_evt.set()
+
+
+async def tick_countdown(refresh_evt: asyncio.Event) -> None:
+    """
+    Requests a redraw every second, so that the funding countdown keeps ticking.
+
+    Args:
+        refresh_evt (asyncio.Event): The event set to request a redraw.
+    """
+    while True:
+        await asyncio.sleep(1)
+        refresh_evt.set()
+
+
 async def main(trading_pairs: List[str]) -> None:
-    async with aiohttp.ClientSession() as session:
+    async with create_session() as session:
         binance_api = BinanceAPI(session)
-        i = 0
-        while True:
-            if i%500 == 0:
-                top_shorted_pairs, top_longed_pairs = await binance_api.fetch_top_funded_pairs(top_n=5)
-                top_gainers, top_losers = await binance_api.get_top_gainers_and_losers(top_n=5)
+        top_pairs = await fetch_top_pairs(binance_api)
+        # Bootstrap from REST, then let the WebSocket streams keep the state up to date
+        state = await binance_api.fetch_ticker_state()
 
-            next_funding_time = date_utils.get_next_funding_time()
-            countdown = date_utils.format_timedelta(next_funding_time - datetime.utcnow())
+        # Redraw only when new data arrived or the countdown changed
+        refresh_evt = asyncio.Event()
+        refresh_evt.set()
+        tasks = [asyncio.create_task(binance_api.stream_tickers(state, refresh_evt)),
+                 asyncio.create_task(refresh_top_pairs(binance_api, top_pairs, refresh_evt)),
+                 asyncio.create_task(tick_countdown(refresh_evt))]
+        try:
+            while True:
+                await refresh_evt.wait()
+                refresh_evt.clear()
 
-            if i%20 == 0:
-                data, num_pairs = await binance_api.fetch_pair_data(trading_pairs=trading_pairs, 
-                                                                    top_shorted_pairs=top_shorted_pairs, 
-                                                                    top_longed_pairs=top_longed_pairs,
-                                                                    top_gainers=top_gainers,
-                                                                    top_losers=top_losers)
-                
-            await print_utils.print_data(data, countdown, num_pairs)  
+                next_funding_time = date_utils.get_next_funding_time()
+                countdown = date_utils.format_timedelta(next_funding_time - int(time.time()))
 
-            i += 1
-            await asyncio.sleep(0.05)
+                data = binance_api.select_pair_data(state, trading_pairs=trading_pairs, **top_pairs)
 
+                await print_utils.print_data(data, countdown)
+        finally:
+            for task in tasks:
+                task.cancel()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Fetch and print futures price and funding rate.')
@@ -62,8 +132,16 @@ if __name__ == "__main__":
             if pair not in trading_pairs:
                 trading_pairs.insert(0, pair)
 
+    # Use the libuv based event loop where it is available (it does not support Windows)
+    run: Callable[[Coroutine[Any, Any, None]], None]
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+
     # Run the main function
     try:
-        asyncio.run(main(trading_pairs))
+        run(main(trading_pairs))
     except KeyboardInterrupt:
         print("\nExiting...")
\ No newline at end of file
@@ -1,6 +1,12 @@
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import heapq
+import orjson
+import random
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from utils.pair_snapshot import PairSnapshot
 
 
 class BinanceAPI:
@@ -12,10 +18,12 @@ class BinanceAPI:
     Main functionalities:
     - Retrieve the price of a trading pair
     - Retrieve the 24-hour change percentage of a trading pair
+    - Retrieve the prices and 24-hour change percentages of all trading pairs in bulk
     - Retrieve the top gainers and losers among Binance Futures trading pairs
     - Retrieve the funding rate of a trading pair
     - Retrieve the top shorted and longed trading pairs based on funding rates
     - Retrieve data for multiple trading pairs
+    - Keep data for all trading pairs up to date through WebSocket streams
 
 
     Fields:
@@ -23,12 +31,24 @@ class BinanceAPI:
     - FUNDING_URL: The URL for retrieving funding rate data.
     - DAILY_CHANGE_URL: The URL for retrieving 24-hour change data.
     - EXCHANGE_INFO_URL: The URL for retrieving Binance Futures trading pair information.
+    - TICKER_STREAM: The WebSocket stream pushing 24-hour ticker data for all trading pairs.
+    - MARK_PRICE_STREAM: The WebSocket stream pushing mark price and funding rate data for all trading pairs.
+    - STREAM_URL: The URL of the combined WebSocket stream.
+    - DEFAULT_TICKER: The price, funding rate, and 24-hour change used for trading pairs without data.
+    - SYMBOLS_TTL: The number of seconds the Binance Futures symbols are cached for.
+    - DAILY_CHANGE_TTL: The number of seconds the 24-hour change data for all trading pairs is cached for.
     - session: The aiohttp.ClientSession object used for making HTTP requests.
     """
     PRICE_URL = "https://fapi.binance.com/fapi/v1/ticker/price"
     FUNDING_URL = "https://fapi.binance.com/fapi/v1/premiumIndex"
-    DAILY_CHANGE_URL = "https://api.binance.com/api/v3/ticker/24hr"
+    DAILY_CHANGE_URL = "https://fapi.binance.com/fapi/v1/ticker/24hr"
     EXCHANGE_INFO_URL = "https://fapi.binance.com/fapi/v1/exchangeInfo"
+    TICKER_STREAM = "!ticker@arr"
+    MARK_PRICE_STREAM = "!markPrice@arr@1s"
+    STREAM_URL = f"wss://fstream.binance.com/stream?streams={TICKER_STREAM}/{MARK_PRICE_STREAM}"
+    DEFAULT_TICKER: Tuple[str, Optional[float], float] = ("0", None, 0.0)
+    SYMBOLS_TTL = 3600
+    DAILY_CHANGE_TTL = 5
 
     def __init__(self, session: aiohttp.ClientSession):
         """
@@ -38,6 +58,46 @@ class BinanceAPI:
             session (aiohttp.ClientSession): The aiohttp.ClientSession object used for making HTTP requests.
         """
         self.session = session
+        # (expiry, value) pairs, compared against time.monotonic()
+        self._symbols_cache: Tuple[float, FrozenSet[str]] = (0.0, frozenset())
+        self._24hr_change_cache: Tuple[float, Dict[str, str]] = (0.0, {})
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, str]] = None, retries: int = 3):
+        """
+        Sends a GET request to the Binance API and decodes the JSON response.
+        Connection errors, timeouts, rate limiting (429) and server errors (5xx) are retried
+        with exponential backoff and jitter, honoring the `Retry-After` header when present.
+        Other error statuses, such as 403 or a 418 IP ban, are raised right away.
+
+        Args:
+            url (str): The URL to send the request to.
+            params (Optional[Dict[str, str]]): The query parameters of the request.
+            retries (int, optional): The maximum number of attempts. Default is 3.
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            aiohttp.ClientResponseError: If the response has a non-retryable error status, or the last attempt has a retryable one.
+            aiohttp.ClientError, asyncio.TimeoutError: If the last attempt fails to connect or times out.
+        """
+        for attempt in range(retries):
+            delay = min(8, 2 ** attempt) + random.random()
+            try:
+                async with self.session.get(url, params=params) as response:
+                    retryable = response.status == 429 or response.status >= 500
+                    if not retryable or attempt == retries - 1:
+                        response.raise_for_status()
+                        return await response.json(loads=orjson.loads)
+                    # Retry-After may also be an HTTP date, keep the backoff delay in that case
+                    try:
+                        delay = float(response.headers.get("Retry-After", delay))
+                    except ValueError:
+                        pass
+            except (aiohttp.ClientOSError, aiohttp.ServerDisconnectedError, asyncio.TimeoutError):
+                if attempt == retries - 1:
+                    raise
+            await asyncio.sleep(delay)
 
     async def get_price(self, pair: str) -> str:
         """
@@ -49,12 +109,14 @@ class BinanceAPI:
         Returns:
             str: The price of the trading pair as a string.
         """
-        async with self.session.get(self.PRICE_URL, params={"symbol": pair}) as response:
-            data = await response.json()
-            if "price" in data:
-                return data["price"]
-            else:
-                return "0"  # or some other default value
+        try:
+            data = await self._get_json(self.PRICE_URL, params={"symbol": pair})
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return "0"
+        if "price" in data:
+            return data["price"]
+        else:
+            return "0"  # or some other default value
 
     async def get_24hr_change(self, pair: str) -> Optional[float]:
         """
@@ -66,35 +128,68 @@ class BinanceAPI:
         Returns:
             Optional[float]: The 24-hour change percentage of the trading pair as a float, or None if the percentage cannot be retrieved or converted.
         """
-        async with self.session.get(self.DAILY_CHANGE_URL, params={"symbol": pair}) as response:
-            data = await response.json()
-            try:
-                return float(data.get("priceChangePercent", 0))
-            except ValueError:
-                return None
+        try:
+            data = await self._get_json(self.DAILY_CHANGE_URL, params={"symbol": pair})
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+        try:
+            return float(data.get("priceChangePercent", 0))
+        except ValueError:
+            return None
+
+    async def fetch_all_prices(self) -> Dict[str, str]:
+        """
+        Retrieves the prices of all trading pairs from the Binance API.
 
-    async def get_24hr_change_all(self) -> List[Dict[str, str]]:
+        Returns:
+            A dictionary where the keys are the trading pair symbols and the values are the corresponding prices as strings.
+        """
+        data = await self._get_json(self.PRICE_URL)
+        return {item["symbol"]: item["price"] for item in data}
+
+    async def fetch_all_24hr(self) -> Dict[str, float]:
+        """
+        Retrieves the 24-hour change percentage of all trading pairs from the Binance API.
+
+        Returns:
+            A dictionary where the keys are the trading pair symbols and the values are the corresponding 24-hour change percentages as floats.
+        """
+        data = await self.get_24hr_change_all()
+        return {symbol: float(change) for symbol, change in data.items()}
+
+    async def get_24hr_change_all(self) -> Dict[str, str]:
         """
         Retrieves the 24-hour change data for all trading pairs from the Binance API.
+        Only the price change percentage is kept out of each ticker, and the result is cached for `DAILY_CHANGE_TTL` seconds.
 
         Returns:
-            A list of dictionaries representing the 24-hour change data for each trading pair.
-            Each dictionary contains various key-value pairs, such as the trading pair symbol, price change percentage, and other related information.
+            A dictionary where the keys are the trading pair symbols and the values are the corresponding price change percentages as strings.
         """
-        async with self.session.get(self.DAILY_CHANGE_URL) as response:
-            data = await response.json()
+        expiry, data = self._24hr_change_cache
+        if time.monotonic() < expiry:
             return data
-
-    async def get_binance_futures_symbols(self) -> List[str]:
+        tickers = await self._get_json(self.DAILY_CHANGE_URL)
+        # Project the ~20 fields of each ticker down to the one in use, so the full response can be freed right away
+        data = {item["symbol"]: item.get("priceChangePercent", "0") for item in tickers}
+        del tickers
+        self._24hr_change_cache = (time.monotonic() + self.DAILY_CHANGE_TTL, data)
+        return data
+
+    async def get_binance_futures_symbols(self) -> FrozenSet[str]:
         """
-        Retrieves a list of Binance Futures trading pair symbols from the Binance API.
+        Retrieves the Binance Futures trading pair symbols from the Binance API.
+        The symbols are cached for `SYMBOLS_TTL` seconds.
 
         Returns:
-            A list of strings representing the symbols of Binance Futures trading pairs.
+            A frozenset of strings representing the symbols of Binance Futures trading pairs.
         """
-        async with self.session.get(self.EXCHANGE_INFO_URL) as response:
-            data = await response.json()
-            return [item['symbol'] for item in data['symbols']]
+        expiry, symbols = self._symbols_cache
+        if time.monotonic() < expiry:
+            return symbols
+        data = await self._get_json(self.EXCHANGE_INFO_URL)
+        symbols = frozenset(item['symbol'] for item in data['symbols'])
+        self._symbols_cache = (time.monotonic() + self.SYMBOLS_TTL, symbols)
+        return symbols
 
     async def get_top_gainers_and_losers(self, top_n: int = 5) -> Tuple[List[str], List[str]]:
         """
@@ -109,12 +204,13 @@ class BinanceAPI:
             The second list represents the symbols of the top losers among Binance Futures trading pairs.
         """
         futures_symbols = await self.get_binance_futures_symbols()
-        data = await self.get_24hr_change_all()
+        data = await self.fetch_all_24hr()
         # Filter the data to include only Binance Futures trading pairs
-        data = [item for item in data if item['symbol'] in futures_symbols and 'USDT' in item['symbol']]
-        sorted_data = sorted(data, key=lambda x: float(x['priceChangePercent']), reverse=True)
-        top_gainers = [x['symbol'] for x in sorted_data[:top_n]]
-        top_losers = [x['symbol'] for x in sorted_data[-top_n:]]
+        changes = [(change, symbol) for symbol, change in data.items()
+                   if symbol in futures_symbols and 'USDT' in symbol]
+        top_gainers = [symbol for _, symbol in heapq.nlargest(top_n, changes)]
+        # Losers are listed from the smallest loss to the biggest one
+        top_losers = [symbol for _, symbol in reversed(heapq.nsmallest(top_n, changes))]
         return top_gainers, top_losers
 
     async def fetch_binance_funding_rate(self, pair: str) -> Optional[float]:
@@ -128,17 +224,14 @@ class BinanceAPI:
             Optional[float]: The funding rate of the trading pair as a float, multiplied by 100, if available in the response data.
             None if the funding rate cannot be retrieved or converted.
         """
-        for _ in range(3):  # Retry up to 3 times
-            try:
-                async with self.session.get(self.FUNDING_URL, params={"symbol": pair}) as response:
-                    data = await response.json()
-                    if "lastFundingRate" in data:
-                        return float(data.get("lastFundingRate")) * 100
-                    else:
-                        return None  # or some other default value
-            except aiohttp.client_exceptions.ClientOSError as e:
-                await asyncio.sleep(1)  # Wait for 1 second before retrying
-        return None  # Return None if all retries fail
+        try:
+            data = await self._get_json(self.FUNDING_URL, params={"symbol": pair})
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None  # Return None if all retries fail
+        if "lastFundingRate" in data:
+            return float(data.get("lastFundingRate")) * 100
+        else:
+            return None  # or some other default value
 
     async def fetch_all_funding_rates(self) -> Dict[str, float]:
         """
@@ -147,9 +240,8 @@ class BinanceAPI:
         Returns:
             A dictionary where the keys are the trading pair symbols and the values are the corresponding funding rates as floats.
         """
-        async with self.session.get(self.FUNDING_URL) as response:
-            data = await response.json()
-            return {item["symbol"]: float(item.get("lastFundingRate", 0)) * 100 for item in data}
+        data = await self._get_json(self.FUNDING_URL)
+        return {item["symbol"]: float(item.get("lastFundingRate", 0)) * 100 for item in data}
 
     async def fetch_top_funded_pairs(self, top_n: int = 5) -> Tuple[List[str], List[str]]:
         """
@@ -167,46 +259,112 @@ class BinanceAPI:
         top_longed_pairs = [pair for pair, _ in sorted_pairs[-top_n:]]
         return top_shorted_pairs, top_longed_pairs
 
-    async def fetch_pair_data(self, **pair_lists: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, float, float, float]]]:
+    async def fetch_ticker_state(self) -> Dict[str, Tuple[str, Optional[float], float]]:
         """
-        Retrieves price, funding rate, and 24-hour change data for multiple trading pairs from the Binance API.
+        Retrieves price, funding rate, and 24-hour change data for all trading pairs from the Binance API.
+        A single bulk request is made per endpoint, and the 24-hour change data is shared with
+        `get_top_gainers_and_losers` through the `get_24hr_change_all` cache.
+
+        Returns:
+            A dictionary where the keys are the trading pair symbols and the values are tuples containing the price, funding rate, and 24-hour change.
+        """
+        prices_result, funding_rates_result, changes_24hr_result = await asyncio.gather(self.fetch_all_prices(),
+                                                                                        self.fetch_all_funding_rates(),
+                                                                                        self.fetch_all_24hr(),
+                                                                                        return_exceptions=True)
+        # A failed endpoint falls back to the defaults instead of failing the whole state
+        prices = {} if isinstance(prices_result, BaseException) else prices_result
+        funding_rates = {} if isinstance(funding_rates_result, BaseException) else funding_rates_result
+        changes_24hr = {} if isinstance(changes_24hr_result, BaseException) else changes_24hr_result
+        price, funding_rate, change_24hr = self.DEFAULT_TICKER
+        return {pair: (prices.get(pair, price), funding_rates.get(pair, funding_rate), changes_24hr.get(pair, change_24hr))
+                for pair in prices.keys() | funding_rates.keys() | changes_24hr.keys()}
+
+    async def stream_tickers(self, state: Dict[str, Tuple[str, Optional[float], float]],
+                             refresh_evt: Optional[asyncio.Event] = None) -> None:
+        """
+        Keeps `state` up to date with the Binance Futures ticker and mark price WebSocket streams.
+        Reconnects with an increasing delay whenever the connection is dropped or a frame cannot be processed,
+        so this coroutine only returns when cancelled.
+
+        Args:
+            state: A dictionary where the keys are the trading pair symbols and the values are tuples containing the price, funding rate, and 24-hour change.
+            Typically bootstrapped with `fetch_ticker_state`.
+            refresh_evt (Optional[asyncio.Event]): An event set whenever `state` has been updated.
+        """
+        delay = 1
+        while True:
+            try:
+                async with self.session.ws_connect(self.STREAM_URL, heartbeat=30) as ws:
+                    delay = 1
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        payload = msg.json(loads=orjson.loads)
+                        self._apply_stream_event(state, payload["stream"], payload["data"])
+                        if refresh_evt is not None:
+                            refresh_evt.set()
+            except Exception:
+                # Connection errors as well as malformed frames, a dead stream would leave stale prices on screen
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _apply_stream_event(self, state: Dict[str, Tuple[str, Optional[float], float]], stream: str, events: List[Dict]) -> None:
+        """
+        Merges a single combined-stream frame into `state`.
+
+        Args:
+            state: The dictionary maintained by `stream_tickers`.
+            stream (str): The name of the stream the frame was received on.
+            events: The list of events carried by the frame.
+        """
+        if stream == self.TICKER_STREAM:
+            for event in events:
+                _, funding_rate, _ = state.get(event["s"], self.DEFAULT_TICKER)
+                state[event["s"]] = (event["c"], funding_rate, float(event["P"]))
+        elif stream == self.MARK_PRICE_STREAM:
+            for event in events:
+                price, _, change_24hr = state.get(event["s"], self.DEFAULT_TICKER)
+                # Delivery contracts have no funding rate
+                funding_rate = float(event["r"]) * 100 if event["r"] else None
+                state[event["s"]] = (price, funding_rate, change_24hr)
+
+    def select_pair_data(self, state: Dict[str, Tuple[str, Optional[float], float]],
+                         **pair_lists: List[str]) -> Dict[str, PairSnapshot]:
+        """
+        Picks price, funding rate, and 24-hour change data for multiple trading pairs out of `state`.
 
         Args:
+            state: A dictionary where the keys are the trading pair symbols and the values are tuples containing the price, funding rate, and 24-hour change.
             pair_lists: A dictionary where the keys are the names of the pair lists and the values are lists of trading pair symbols.
 
         Returns:
-            A dictionary where the keys are the names of the pair lists and the values are lists of tuples containing the trading pair symbol, price, funding rate, and 24-hour change.
-            The total count of trading pairs, including duplicates.
-        """
-        tasks = []
-        pair_to_list = {}
-        list_names = set()
-        pairs_names = []
-        seen = set()
-        dups = 0
+            A dictionary where the keys are the names of the pair lists and the values are `PairSnapshot` objects holding the trading pair symbols, prices, funding rates, and 24-hour changes.
+        """
+        pair_to_lists: Dict[str, List[str]] = {}
         for list_name, pair_list in pair_lists.items():
-            list_names.add(list_name)
             for pair in pair_list:
-                pair_to_list[pair] = pair_to_list.get(pair, []) + [list_name]
-                if pair in seen:
-                    dups += 1
-                    continue
-                tasks.append(self.get_price(pair))
-                tasks.append(self.fetch_binance_funding_rate(pair))
-                tasks.append(self.get_24hr_change(pair))
-                seen.add(pair)
-                pairs_names.append(pair)
-
-        results = await asyncio.gather(*tasks)
-
-        data = {list_name: [] for list_name in list_names}
-        for j in range(0, len(results), 3):
-            price = results[j]
-            funding_rate = results[j+1]
-            change_24hr = results[j+2]
-            pair = pairs_names[j//3]
-            list_names = pair_to_list[pair]
-            for l_name in list_names:
-                data[l_name].append((pair, price, funding_rate, change_24hr))
-
-        return data, len(pairs_names) + dups
\ No newline at end of file
+                pair_to_lists.setdefault(pair, []).append(list_name)
+
+        data = {list_name: PairSnapshot() for list_name in pair_lists}
+        for pair, lists_for_pair in pair_to_lists.items():
+            price, funding_rate, change_24hr = state.get(pair, self.DEFAULT_TICKER)
+            for list_name in lists_for_pair:
+                data[list_name].append(pair, price, funding_rate, change_24hr)
+
+        return data
+
+    async def fetch_pair_data(self, **pair_lists: List[str]) -> Dict[str, PairSnapshot]:
+        """
+        Retrieves price, funding rate, and 24-hour change data for multiple trading pairs from the Binance API.
+        A single bulk request is made per endpoint, regardless of the number of trading pairs.
+
+        Args:
+            pair_lists: A dictionary where the keys are the names of the pair lists and the values are lists of trading pair symbols.
+
+        Returns:
+            A dictionary where the keys are the names of the pair lists and the values are `PairSnapshot` objects holding the trading pair symbols, prices, funding rates, and 24-hour changes.
+        """
+        state = await self.fetch_ticker_state()
+        return self.select_pair_data(state, **pair_lists)
@@ -1,36 +1,35 @@
-from datetime import datetime, timedelta
+import time
+from typing import Final
 
-def get_next_funding_time() -> datetime:
+FUNDING_INTERVAL: Final = 8 * 3600  # Funding happens every 8 hours, at 00:00, 08:00 and 16:00 UTC
+
+_next_funding_epoch: int = 0
+
+def get_next_funding_time() -> int:
     """
-    Returns the next funding time as a `datetime` object.
+    Returns the next funding time as a Unix timestamp.
     
-    The next funding time is determined based on the current time and a set of conditions.
+    The next funding time is cached and only recomputed once it has passed.
     
-    :return: The next funding time as a `datetime` object.
+    :return: The next funding time in seconds since the epoch.
     """
-    now = datetime.utcnow()
-    if now.hour < 8:
-        next_hour = 8
-    elif now.hour < 16:
-        next_hour = 16
-    else:
-        next_hour = 0
-        now += timedelta(days=1)  # move to the next day if current time is past 16:00
-
-    next_funding_time = datetime(now.year, now.month, now.day, next_hour)
-    return next_funding_time
+    global _next_funding_epoch
+    now = int(time.time())
+    if now >= _next_funding_epoch:
+        # Funding times are aligned to the epoch, since days start at 00:00 UTC
+        _next_funding_epoch = (now // FUNDING_INTERVAL + 1) * FUNDING_INTERVAL
+    return _next_funding_epoch
 
-def format_timedelta(td: timedelta) -> str:
+def format_timedelta(total_seconds: int) -> str:
     """
-    Formats a timedelta object as a string representing the duration in hours, minutes, and seconds.
+    Formats a number of seconds as a string representing the duration in hours, minutes, and seconds.
 
     Args:
-        td (timedelta): The duration to be formatted.
+        total_seconds (int): The duration to be formatted, in seconds.
 
     Returns:
         str: The duration formatted as "HH:MM:SS".
     """
-    total_seconds = int(td.total_seconds())
     hours, remainder = divmod(total_seconds, 3600)
     minutes, seconds = divmod(remainder, 60)
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
\ No newline at end of file
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class PairSnapshot:
+    """
+    The `PairSnapshot` class holds the data of a list of trading pairs as parallel columns.
+
+    Fields:
+    - symbols: The trading pair symbols.
+    - prices: The prices of the trading pairs as strings.
+    - funding_rates: The funding rates of the trading pairs, or None when not available.
+    - changes_24hr: The 24-hour change percentages of the trading pairs.
+    """
+    symbols: List[str] = field(default_factory=list)
+    prices: List[str] = field(default_factory=list)
+    funding_rates: List[Optional[float]] = field(default_factory=list)
+    changes_24hr: List[float] = field(default_factory=list)
+
+    def append(self, symbol: str, price: str, funding_rate: Optional[float], change_24hr: float) -> None:
+        """
+        Appends the data of a trading pair to the columns.
+
+        Args:
+            symbol (str): The trading pair symbol.
+            price (str): The price of the trading pair.
+            funding_rate (Optional[float]): The funding rate of the trading pair.
+            change_24hr (float): The 24-hour change percentage of the trading pair.
+        """
+        self.symbols.append(symbol)
+        self.prices.append(price)
+        self.funding_rates.append(funding_rate)
+        self.changes_24hr.append(change_24hr)
\ No newline at end of file
@@ -1,50 +1,76 @@
-from typing import List, Tuple, Dict
-from utils.date_utils import * 
+import sys
+from typing import Dict, Final, List
+from utils.pair_snapshot import PairSnapshot
 
-def print_pairs(data: List[Tuple[str, float, float, float]], title: str, header: bool = True) -> None:
+_GREEN: Final = '\033[92m'  # Positive 24h change
+_RED: Final = '\033[91m'  # Negative 24h change
+_NA: Final = 'N/A'
+_HEADER: Final = (f"  {'Pair':<8} | "
+                  f"{'Price':<10} | "
+                  f"{'% Funding':<10} | "
+                  f"{'% 24h Change':<10}")
+
+# Lines written by the previous call to print_data, used to only redraw the lines that changed
+_previous_frame: List[str] = []
+
+def format_pairs(data: PairSnapshot, title: str, header: bool = True) -> List[str]:
     """
-    Prints formatted data to the console.
+    Formats pair data as lines of text.
 
     Args:
-        data (List[Tuple[str, float, float, float]]): A list of tuples containing the pair information. 
-        Each tuple represents a row of data and consists of the pair name, price, funding rate, and 24-hour change.
-        title (str): The title for the section of pairs being printed.
-        header (bool, optional): A flag indicating whether to print the header row or not. Defaults to True.
+        data (PairSnapshot): The pair information, as columns of pair names, prices, funding rates, and 24-hour changes.
+        title (str): The title for the section of pairs being formatted.
+        header (bool, optional): A flag indicating whether to include the header row or not. Defaults to True.
 
     Returns:
-        None: The function only prints the formatted data to the console.
+        List[str]: The formatted lines, starting with an empty line and the title.
     """
-    print(f"\r\n--- {title} ---")
+    lines = ["", f"--- {title} ---"]
     if header:
-        print(f"  {'Pair':<8} | "
-              f"{'Price':<10} | "
-              f"{'% Funding':<10} | "
-              f"{'% 24h Change':<10}")
-
-    for pair, price, funding_rate, change_24hr in data:
-        color = '\033[92m' if change_24hr >= 0 else '\033[91m'  # Green for positive, red for negative
-        print(color + f"{pair:<10} | "
-              f"{price if price is not None else 'N/A':<10} | "
-              f"{round(funding_rate, 4) if funding_rate is not None else 'N/A':<10} | "
-              f"{round(change_24hr, 3) if change_24hr is not None else 'N/A':<10}" + '\033[0m')  # Reset color
-        
-async def print_data(data: Dict, countdown: str, num_pairs: int) -> None:
+        lines.append(_HEADER)
+
+    for pair, price, funding_rate, change_24hr in zip(data.symbols, data.prices, data.funding_rates, data.changes_24hr):
+        color = _GREEN if change_24hr >= 0 else _RED
+        lines.append(f"{color}{pair:<10} | "
+                     f"{price if price is not None else _NA:<10} | "
+                     f"{round(funding_rate, 4) if funding_rate is not None else _NA:<10} | "
+                     f"{round(change_24hr, 3) if change_24hr is not None else _NA:<10}\033[0m")  # Reset color
+    return lines
+
+async def print_data(data: Dict[str, PairSnapshot], countdown: str) -> None:
     """
     Prints formatted data to the console.
+    Only the lines that changed since the previous call are rewritten, in a single write.
 
     Args:
-        data (List[Tuple[str, float, float, float]]): A list of tuples containing the data to be printed.
-        Each tuple represents a row of data and consists of the pair name, price, funding rate, and 24-hour change.
+        data (Dict[str, PairSnapshot]): A dictionary mapping the names of the pair lists to the data to be printed.
+        countdown (str): The time left until the next funding.
 
     Returns:
         None: The function only prints the formatted data to the console.
     """
-    print_pairs(data['trading_pairs'], "My Pairs Information", header=True)
-    print_pairs(data['top_shorted_pairs'], "Top shorted pairs", header=True)
-    print_pairs(data['top_longed_pairs'], "Top longed pairs", header=True)  # New line
-    print_pairs(data['top_gainers'], "Top Gainers", header=True)
-    print_pairs(data['top_losers'], "Top Losers", header=True)
-
-    # Move the cursor up by the number of trading pairs
-    print(f"\nFunding countdown: {countdown} ")
-    print(f"\033[{num_pairs + 17}A", end="")
\ No newline at end of file
+    global _previous_frame
+    frame = (format_pairs(data['trading_pairs'], "My Pairs Information", header=True)
+             + format_pairs(data['top_shorted_pairs'], "Top shorted pairs", header=True)
+             + format_pairs(data['top_longed_pairs'], "Top longed pairs", header=True)
+             + format_pairs(data['top_gainers'], "Top Gainers", header=True)
+             + format_pairs(data['top_losers'], "Top Losers", header=True)
+             + ["", f"Funding countdown: {countdown} "])
+
+    # Clear the screen on the first frame, since lines are addressed by their absolute row
+    output = [] if _previous_frame else ["\033[2J"]
+    for row, line in enumerate(frame, start=1):
+        if row > len(_previous_frame) or _previous_frame[row - 1] != line:
+            output.append(f"\033[{row};1H\033[2K{line}")
+    # Erase the leftovers of a longer previous frame
+    for row in range(len(frame) + 1, len(_previous_frame) + 1):
+        output.append(f"\033[{row};1H\033[2K")
+    _previous_frame = frame
+    # Nothing changed, skip the write altogether
+    if not output:
+        return
+
+    # Park the cursor below the frame
+    output.append(f"\033[{len(frame) + 1};1H")
+    sys.stdout.write("".join(output))
+    sys.stdout.flush()
\ No newline at end of file